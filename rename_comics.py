@@ -1,13 +1,27 @@
 #!/usr/bin/env python3
 import argparse
+import concurrent.futures
+import errno
+import functools
 import os
 import re
 import shutil
 import sys
-from typing import Optional, Tuple
+import threading
+from typing import Dict, Optional, Set, Tuple
 
+try:
+    # Optional: possessive quantifier support for the filename patterns on Python < 3.11
+    import regex as _regex
+except ImportError:
+    _regex = None
 
-COMIC_EXTENSIONS = {".cbr", ".cbz"}
+
+COMIC_EXTENSIONS = frozenset({".cbr", ".cbz"})
+
+# KEY=VALUE line in a .env file; the value may be wrapped in matching single or double quotes.
+# Blank lines and "#" comment lines don't match.
+_ENV_LINE_RE = re.compile(r"""^\s*([^=#\s][^=]*?)\s*=\s*(?:"([^"]*)"|'([^']*)'|(.*?))\s*$""")
 
 
 def load_env_file(env_path: str = ".env") -> dict:
@@ -20,16 +34,15 @@ def load_env_file(env_path: str = ".env") -> dict:
         try:
             with open(env_path, "r") as f:
                 for line in f:
-                    line = line.strip()
-                    # Skip empty lines and comments
-                    if not line or line.startswith("#"):
-                        continue
-                    # Parse KEY=VALUE format
-                    if "=" in line:
-                        key, value = line.split("=", 1)
-                        key = key.strip()
-                        value = value.strip().strip('"').strip("'")
-                        env_vars[key] = value
+                    match = _ENV_LINE_RE.match(line)
+                    if match:
+                        key, double_quoted, single_quoted, bare = match.groups()
+                        if double_quoted is not None:
+                            env_vars[key] = double_quoted
+                        elif single_quoted is not None:
+                            env_vars[key] = single_quoted
+                        else:
+                            env_vars[key] = bare
         except Exception:
             # If we can't read the file, just return empty dict
             pass
@@ -42,198 +55,137 @@ env_file_vars = load_env_file()
 EXTERNAL_COMICS_DIR = env_file_vars.get("COMIC_SORTER_EXTERNAL_DIR") or os.environ.get("COMIC_SORTER_EXTERNAL_DIR")
 
 
-def parse_annual_filename(stem: str) -> Optional[Tuple[str, str, int, Optional[str]]]:
+# All supported filename shapes, tried in priority order as one alternation.
+# Each branch populates its own family of named groups:
+#
+#   vol_*   Volumes:     "Title v02 (2012)", "Title v2 (2012) extra rip info"
+#   ann_*   Annuals:     "Title 2025 Annual 001 (2025)", "Title 2025 Annual #001"
+#   iss_*   Issues:      "Title #001 (2019)", "Title 02 (of 04) (2025)", "Title 001"
+#   std_*   Standalone:  "Title (2025)", "Title - Subtitle (2022) (digital)"
+#   bare_*  No year:     "Title", "Title (20th Anniversary Edition)"
+#
+# The bare branch refuses stems carrying issue, volume or year markers so those
+# end up in error/ instead of being mistaken for a plain title.
+#
+# Possessive quantifiers (++, *+, ?+) are only used where giving characters back
+# could never produce a match, so they change nothing except the work spent failing.
+_VOL_BRANCH = r"(?P<vol_title>.+?)\s++v(?P<vol_num>\d{1,4}+)\s*+\((?P<vol_year>\d{4})\)"
+_ANNUAL_BRANCH = r"(?P<ann_title>.+?)\s++(?P<ann_title_year>\d{4})\s++Annual\s++#?+(?P<ann_issue>\d{1,4}+)\s*+(?:\((?P<ann_year>\d{4})\))?"
+_ISSUE_BRANCH = r"(?P<iss_title>.+?)\s++#?+(?P<iss_issue>\d{1,4}+)\s*+(?:\(of\s++\d++\s*+\))?\s*+(?:\((?P<iss_year>\d{4})\))?"
+_STANDALONE_BRANCH = r"(?P<std_title>.+?)\s++\((?P<std_year>\d{4})\)"
+_BARE_BRANCH = r"(?!.*#\d)(?!.*\sv\d)(?!.*\(\d{4}\))(?P<bare_title>[^(]+?)(?:\s++\([^)]++\))?\s*+$"
+
+# re only understands possessive quantifiers from Python 3.11. On older versions the
+# third-party regex module is used when installed (it is slower than re on typical
+# names, so it is not preferred otherwise); failing that the quantifiers are made
+# plain greedy again. Set to False to always use the standard library re module.
+ALLOW_REGEX_MODULE = True
+_POSSESSIVE_IN_RE = sys.version_info >= (3, 11)
+_PATTERN_ENGINE = _regex if ALLOW_REGEX_MODULE and _regex is not None and not _POSSESSIVE_IN_RE else re
+_POSSESSIVE_SUPPORTED = _PATTERN_ENGINE is not re or _POSSESSIVE_IN_RE
+_POSSESSIVE_RE = re.compile(r"(?<=[+*?}])\+")
+
+
+@functools.lru_cache(maxsize=None)
+def _master_re(volume: bool, annual: bool, standalone: bool):
     """
-    Extract (base_title, full_title, issue_number, year) from a filename stem for annual issues.
-    Handles patterns like "Title YYYY Annual 001 (YYYY)" where the year appears in the title.
-    
-    base_title is used for folder organization (e.g., "Absolute Batman")
-    full_title includes the year and "Annual" for the filename (e.g., "Absolute Batman 2025 Annual")
-
-    Expected pattern examples:
-    - Title 2025 Annual 001 (2025)
-    - Title 2025 Annual #001 (2025)
-    - Absolute Batman 2025 Annual 001 (2025)
-
-    Returns None if not parseable.
+    Compile the alternation with only the branches a stem can possibly match.
+    Branches that are left out would have failed anyway, so the result is the same.
     """
-    # Pattern: Title + YYYY + " Annual " + optional # + issue number + optional (YYYY)
-    match = re.search(r"^(?P<title>.+?)\s+(?P<title_year>\d{4})\s+Annual\s+#?(?P<issue>\d{1,4})\s*(?:\((?P<year>\d{4})\)\)?)?", stem, flags=re.IGNORECASE)
-    if not match:
-        return None
-
-    title_base = match.group("title").strip()
-    title_year = match.group("title_year")
-    issue_str = match.group("issue")
-    year = match.group("year")  # May be None
-
-    try:
-        issue_num = int(issue_str)
-    except ValueError:
-        return None
-
-    # Base title for folder organization (e.g., "Absolute Batman")
-    base_title = re.sub(r"\s+", " ", title_base)
-    
-    # Full title for filename (e.g., "Absolute Batman 2025 Annual")
-    full_title = f"{title_base} {title_year} Annual"
-    full_title = re.sub(r"\s+", " ", full_title)
+    branches = []
+    if volume:
+        branches.append(_VOL_BRANCH)
+    if annual:
+        branches.append(_ANNUAL_BRANCH)
+    branches.append(_ISSUE_BRANCH)
+    if standalone:
+        branches.append(_STANDALONE_BRANCH)
+    branches.append(_BARE_BRANCH)
+    pattern = "^(?:" + "|".join(branches) + ")"
+    if not _POSSESSIVE_SUPPORTED:
+        pattern = _POSSESSIVE_RE.sub("", pattern)
+    return _PATTERN_ENGINE.compile(pattern, _PATTERN_ENGINE.IGNORECASE)
 
-    return base_title, full_title, issue_num, year
 
 
-def parse_filename(stem: str) -> Optional[Tuple[str, int, Optional[str]]]:
+def split_comic_name(name: str) -> Optional[Tuple[str, str]]:
     """
-    Extract (title, issue_number, year) from a filename stem.
-    Year may be None if not present.
-
-    Expected loose pattern examples:
-    - Title 001 (2019)
-    - Title #1 (2019)
-    - Title #001 (2019) extra rip info
-    - Title 02 (of 04) (2025) extra rip info
-    - Title #01
-    - Title 001
-
-    Returns None if not parseable.
+    Split a file name (no directory part) into (stem, ext) if it has a comic extension.
+    Returns None for other files, including dotfiles such as ".cbz".
     """
-    # Normalize stray double right parens around year by ignoring trailing parens
-    # Regex: leading title (non-greedy) + optional # + issue digits + optional (of xx) + optional (year)
-    match = re.search(r"^(?P<title>.+?)\s+#?(?P<issue>\d{1,4})\s*(?:\(of\s+\d+\s*\))?\s*(?:\((?P<year>\d{4})\)\)?)?", stem, flags=re.IGNORECASE)
-    if not match:
+    dot = name.rfind(".")
+    if dot <= 0:
         return None
-
-    title = match.group("title").strip()
-    issue_str = match.group("issue")
-    year = match.group("year")  # May be None
-
-    try:
-        issue_num = int(issue_str)
-    except ValueError:
+    ext = name[dot:]
+    if ext.lower() not in COMIC_EXTENSIONS:
         return None
+    return name[:dot], ext
 
-    # Collapse internal whitespace in title
-    title = re.sub(r"\s+", " ", title)
-
-    return title, issue_num, year
-
-
-def parse_volume_filename(stem: str) -> Optional[Tuple[str, int, str]]:
-    """
-    Extract (title, volume_number, year) from a filename stem for trades/volumes.
 
-    Expected loose pattern examples:
-    - Title v02 (2012)
-    - Title v2 (2012) extra rip info
+def is_comic_file(name: str) -> bool:
+    return split_comic_name(name) is not None
 
-    Returns None if not parseable.
-    """
-    match = re.search(r"^(?P<title>.+?)\s+v(?P<vol>\d{1,4})\s*\((?P<year>\d{4})\)\)?", stem, flags=re.IGNORECASE)
-    if not match:
-        return None
 
-    title = match.group("title").strip()
-    vol_str = match.group("vol")
-    year = match.group("year")
-
-    try:
-        vol_num = int(vol_str)
-    except ValueError:
-        return None
-
-    title = re.sub(r"\s+", " ", title)
-
-    return title, vol_num, year
+def ensure_dir(path: str) -> None:
+    # exist_ok makes a separate isdir() stat unnecessary
+    os.makedirs(path, exist_ok=True)
 
 
-def parse_standalone_filename(stem: str) -> Optional[Tuple[str, str]]:
+def move_path(src: str, dest: str) -> None:
     """
-    Extract (title, year) from a filename stem for standalone comics without issue numbers.
-
-    Expected loose pattern examples:
-    - Title (2025)
-    - Title (2024) extra rip info
-    - Title - Subtitle (2022) (digital) (extra info)
-
-    Returns None if not parseable.
+    Move a file or folder with a single os.rename, which is all that is needed
+    within the target directory. Falls back to shutil.move (copy + delete) when
+    the destination is on another filesystem.
     """
-    # Match: title (ending before year) + year in parentheses
-    # We need to avoid matching issue numbers or volume numbers, so we check that
-    # there's no #digit or vdigit or digit followed by (of xx) before the year
-    match = re.search(r"^(?P<title>.+?)\s+\((?P<year>\d{4})\)", stem)
-    if not match:
-        return None
-
-    title = match.group("title").strip()
-    year = match.group("year")
-
-    # Check that this doesn't match an issue or volume pattern
-    # If title ends with a number pattern that could be an issue, this is probably a numbered issue
-    # We'll let the other parsers handle those cases first
-    if re.search(r"#?\d{1,4}\s*$", title):
-        # Title ends with a number, might be an issue number
-        return None
-    if re.search(r"\s+v\d{1,4}\s*$", title, flags=re.IGNORECASE):
-        # Title ends with volume pattern
-        return None
-
-    # Collapse internal whitespace in title
-    title = re.sub(r"\s+", " ", title)
-
-    return title, year
+    try:
+        os.rename(src, dest)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(src, dest)
 
 
-def parse_standalone_no_year_filename(stem: str) -> Optional[str]:
+def _build_external_index() -> Dict[str, Tuple[str, Set[str]]]:
     """
-    Extract title from a filename stem for standalone comics without issue numbers or years.
-    Handles filenames that may have edition/subtitle info in parentheses.
-
-    Expected loose pattern examples:
-    - Title
-    - Title (20th Anniversary Edition)
-    - Title - Subtitle
-    - Title - Subtitle (Special Edition)
-
-    Returns None if not parseable (e.g., if it matches issue/volume patterns).
+    Scan EXTERNAL_COMICS_DIR once and map each lowercased title folder name to
+    (folder_path, set of lowercased file stems inside it).
+    If several folders differ only by case, the first one listed wins.
     """
-    # Check that this doesn't match an issue pattern (issue number after # or space, before parentheses or end)
-    # More specific: # followed by digits, or space followed by digits that are clearly an issue number
-    if re.search(r"#\d{1,4}\s*(?:\(of\s+\d+\s*\))?\s*(?:\(\d{4}\))?", stem, flags=re.IGNORECASE):
-        # Has issue number pattern with #
-        return None
-    # Check for standalone digits that look like issue numbers (after space, possibly before "of" or year)
-    if re.search(r"\s+\d{1,4}\s*(?:\(of\s+\d+\s*\)|\(\d{4}\))", stem):
-        # Has issue number pattern without #
-        return None
-    # Check for volume pattern (v followed by digits)
-    if re.search(r"\s+v\d{1,4}\s*(?:\(\d{4}\))?", stem, flags=re.IGNORECASE):
-        # Has volume pattern
-        return None
-    
-    # If there's a 4-digit year in parentheses at the end, let parse_standalone_filename handle it
-    if re.search(r"\(\d{4}\)", stem):
-        return None
-
-    # Extract the title part (everything before optional parentheses with non-year content)
-    # Try to match title with optional parentheses content
-    match = re.match(r"^(?P<title>[^(]+?)(?:\s+\([^)]+\))?\s*$", stem)
-    if match:
-        title = match.group("title").strip()
-        # Collapse internal whitespace
-        title = re.sub(r"\s+", " ", title)
-        return title
-
-    return None
+    index = {}
+    if not EXTERNAL_COMICS_DIR or not os.path.isdir(EXTERNAL_COMICS_DIR):
+        # External directory not configured or doesn't exist, treat as no duplicates
+        return index
 
+    try:
+        with os.scandir(EXTERNAL_COMICS_DIR) as folders:
+            for folder in folders:
+                if not folder.is_dir():
+                    continue
+                folder_lower = folder.name.lower()
+                if folder_lower in index:
+                    continue
+                stems = set()
+                try:
+                    with os.scandir(folder.path) as files:
+                        for file_entry in files:
+                            if file_entry.is_file():
+                                file_stem, _ = os.path.splitext(file_entry.name)
+                                stems.add(file_stem.lower())
+                except OSError:
+                    # Can't read folder, treat it as empty
+                    pass
+                index[folder_lower] = (folder.path, stems)
+    except OSError:
+        # Can't read external directory
+        pass
 
-def is_comic_file(path: str) -> bool:
-    _, ext = os.path.splitext(path)
-    return ext.lower() in COMIC_EXTENSIONS
+    return index
 
 
-def ensure_dir(path: str) -> None:
-    if not os.path.isdir(path):
-        os.makedirs(path, exist_ok=True)
+@functools.lru_cache(maxsize=None)
+def _external_index() -> Dict[str, Tuple[str, Set[str]]]:
+    """Cached _build_external_index(); cleared at the start of each process_directory run."""
+    return _build_external_index()
 
 
 def check_external_duplicate(title: str, desired_filename: str) -> bool:
@@ -243,115 +195,152 @@ def check_external_duplicate(title: str, desired_filename: str) -> bool:
     File extensions are ignored when comparing filenames.
     
     Returns True if a file with the same stem (name without extension) exists in EXTERNAL_COMICS_DIR/Title/ (case-insensitive)
+    The external directory is only listed (and checked for existence) once per run, see _external_index().
     """
-    if not os.path.isdir(EXTERNAL_COMICS_DIR):
-        # External directory doesn't exist, treat as no duplicate
+    entry = _external_index().get(title.lower())
+    if entry is None:
         return False
-    
-    # Extract stem (filename without extension) from desired_filename for comparison
     desired_stem, _ = os.path.splitext(desired_filename)
-    desired_stem_lower = desired_stem.lower()
-    
-    # Case-insensitive search for title folder
-    title_lower = title.lower()
-    try:
-        for folder_name in os.listdir(EXTERNAL_COMICS_DIR):
-            folder_path = os.path.join(EXTERNAL_COMICS_DIR, folder_name)
-            if os.path.isdir(folder_path) and folder_name.lower() == title_lower:
-                # Found matching folder (case-insensitive)
-                # Now check for filename stem (case-insensitive, ignoring extension)
-                try:
-                    for file_name in os.listdir(folder_path):
-                        if os.path.isfile(os.path.join(folder_path, file_name)):
-                            file_stem, _ = os.path.splitext(file_name)
-                            if file_stem.lower() == desired_stem_lower:
-                                return True
-                except OSError:
-                    # Can't read folder, skip it
-                    pass
-                break
-    except OSError:
-        # Can't read external directory
-        pass
-    
-    return False
+    return desired_stem.lower() in entry[1]
 
 
-def unique_destination_path(base_dir: str, desired_name: str, ext: str) -> str:
+class _DirNameCache:
     """
-    Return a unique destination path by appending " (1)", "(2)", ... if needed.
+    Per-directory sets of taken file names, each loaded with a single os.scandir.
+    reserve() hands out unique destination paths without a stat per candidate.
+
+    Names are compared case-insensitively so a reserved name can never clash on a
+    case-insensitive filesystem (where os.rename would silently replace the file).
     """
-    candidate = os.path.join(base_dir, desired_name + ext)
-    if not os.path.exists(candidate):
-        return candidate
 
-    counter = 1
-    while True:
-        candidate = os.path.join(base_dir, f"{desired_name} ({counter}){ext}")
-        if not os.path.exists(candidate):
-            return candidate
-        counter += 1
+    def __init__(self) -> None:
+        self._names = {}
+        # Worker threads reserve error/ names when a rename fails
+        self._lock = threading.Lock()
+
+    def _names_in(self, base_dir: str) -> Set[str]:
+        names = self._names.get(base_dir)
+        if names is None:
+            names = set()
+            try:
+                with os.scandir(base_dir) as it:
+                    for entry in it:
+                        names.add(entry.name.lower())
+            except OSError:
+                # Missing or unreadable directory, nothing to collide with yet
+                pass
+            self._names[base_dir] = names
+        return names
+
+    def reserve(self, base_dir: str, desired_name: str, ext: str) -> str:
+        """
+        Return a unique destination path by appending " (1)", "(2)", ... if needed,
+        and mark it as taken.
+        """
+        with self._lock:
+            names = self._names_in(base_dir)
+            candidate = desired_name + ext
+            counter = 1
+            while candidate.lower() in names:
+                candidate = f"{desired_name} ({counter}){ext}"
+                counter += 1
+            names.add(candidate.lower())
+        return os.path.join(base_dir, candidate)
+
+    def release(self, path: str) -> None:
+        """Give back a reserved path whose move failed."""
+        base_dir, name = os.path.split(path)
+        with self._lock:
+            names = self._names.get(base_dir)
+            if names is not None:
+                names.discard(name.lower())
+
+
+# Precomputed "#000".."#999" so the common case needs no formatting
+_ISSUE_LABELS = [f"#{i:03d}" for i in range(1000)]
 
 
 def format_issue(issue_num: int) -> str:
     # Use #XXX for <= 999, otherwise use the full number (e.g., #1000)
     if issue_num <= 999:
-        return f"#{issue_num:03d}"
+        return _ISSUE_LABELS[issue_num]
     return f"#{issue_num}"
 
 
+# Series titles reuse the same handful of words, so cache per-word capitalization
+_capitalize_word = functools.lru_cache(maxsize=2048)(str.capitalize)
+
+
+@functools.lru_cache(maxsize=4096)
 def capitalize_title(title: str) -> str:
     """
     Capitalize a comic title, preserving word boundaries.
-    Example: "batman - dark victory" -> "Batman - Dark Victory"
+    Leading/trailing whitespace is dropped and internal runs collapse to one space.
+    Example: "batman  - dark victory" -> "Batman - Dark Victory"
     """
-    # Split on whitespace and capitalize each word
-    words = title.split()
-    capitalized_words = [word.capitalize() for word in words]
-    return " ".join(capitalized_words)
+    return " ".join(_capitalize_word(word) for word in title.split())
 
 
+@functools.lru_cache(maxsize=4096)
 def plan_new_name_and_title(stem: str) -> Optional[Tuple[str, str]]:
     """Return (title, desired_stem) for either issue, volume, or standalone forms."""
-    vol = parse_volume_filename(stem)
-    if vol:
-        title, vol_num, year = vol
-        title = capitalize_title(title)
-        return title, f"{title} Vol. {vol_num} ({year})"
+    # Cheap substring tests rule out branches before the regex engine runs:
+    # volumes and standalones need a "(YYYY)", volumes a "v", annuals the word itself
+    stem_lower = stem.lower()
+    has_paren = "(" in stem
+    pattern = _master_re(has_paren and "v" in stem_lower, "annual" in stem_lower, has_paren)
+    match = pattern.match(stem)
+    if not match:
+        return None
 
-    # Check for annual issues before regular issues (annual has more specific pattern)
-    annual = parse_annual_filename(stem)
-    if annual:
-        base_title, full_title, issue_num, year = annual
+    # Every branch's groups share a prefix, so the last group to close identifies the branch
+    kind = match.lastgroup.split("_", 1)[0]
+    if kind == "vol":
+        title = capitalize_title(match.group("vol_title"))
+        return title, f"{title} Vol. {int(match.group('vol_num'))} ({match.group('vol_year')})"
+
+    if kind == "ann":
         # Use base_title for folder, full_title for filename
-        base_title = capitalize_title(base_title)
-        full_title = capitalize_title(full_title)
+        title_base = match.group("ann_title")
+        base_title = capitalize_title(title_base)
+        full_title = capitalize_title(f"{title_base} {match.group('ann_title_year')} Annual")
+        issue_num = int(match.group("ann_issue"))
+        year = match.group("ann_year")
         if year:
             return base_title, f"{full_title} {format_issue(issue_num)} ({year})"
         else:
             return base_title, f"{full_title} {format_issue(issue_num)}"
 
-    iss = parse_filename(stem)
-    if iss:
-        title, issue_num, year = iss
-        title = capitalize_title(title)
+    if kind == "iss":
+        title = capitalize_title(match.group("iss_title"))
+        issue_num = int(match.group("iss_issue"))
+        year = match.group("iss_year")
         if year:
             return title, f"{title} {format_issue(issue_num)} ({year})"
         else:
             return title, f"{title} {format_issue(issue_num)}"
 
-    standalone = parse_standalone_filename(stem)
-    if standalone:
-        title, year = standalone
+    if kind == "std":
+        title = match.group("std_title")
+        # If the title ends with a number ("Title 12", "Title #12", "Title v2") this is a
+        # malformed issue/volume rather than a standalone comic. Checking the last character
+        # covers all three, since issue and volume markers end in a digit.
+        if title.rstrip()[-1:].isdecimal():
+            return None
         title = capitalize_title(title)
-        return title, f"{title} ({year})"
+        return title, f"{title} ({match.group('std_year')})"
 
-    standalone_no_year = parse_standalone_no_year_filename(stem)
-    if standalone_no_year:
-        title = capitalize_title(standalone_no_year)
-        return title, title
+    title = capitalize_title(match.group("bare_title"))
+    if not title:
+        return None
+    return title, title
 
-    return None
+
+def write_lines(lines: list) -> None:
+    """Write buffered output lines to stdout in one call and empty the buffer."""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+        lines.clear()
 
 
 def print_summary_table(errors: list, duplicates: list) -> None:
@@ -380,10 +369,15 @@ def print_summary_table(errors: list, duplicates: list) -> None:
 
 def process_directory(target_dir: str, dry_run: bool, verbose: bool) -> Tuple[int, int, int, int, list, list]:
     """Process files in target_dir. Returns (renamed_count, skipped_count, error_count, duplicates_count, errors_list, duplicates_list)."""
-    error_dir = os.path.join(target_dir, "error")
-    duplicates_dir = os.path.join(target_dir, "possibleDuplicates")
+    # Every path built below starts with this prefix, so slicing it off replaces os.path.relpath
+    target_prefix = target_dir if target_dir.endswith(os.sep) else target_dir + os.sep
+    prefix_len = len(target_prefix)
+    error_dir = target_prefix + "error"
+    duplicates_dir = target_prefix + "possibleDuplicates"
     ensure_dir(error_dir)
     ensure_dir(duplicates_dir)
+    # Pick up any changes to the external directory since the last run
+    _external_index.cache_clear()
 
     renamed = 0
     skipped = 0
@@ -392,98 +386,149 @@ def process_directory(target_dir: str, dry_run: bool, verbose: bool) -> Tuple[in
     errors_list = []
     duplicates_list = []
     folders_with_duplicates = set()  # Track title folders that contain duplicates
+    dest_names = _DirNameCache()
+
+    # Phase 1: plan every file up front, no filesystem changes yet.
+    # DirEntry caches the file type from the directory read, so is_file() needs no extra stat
+    with os.scandir(target_dir) as it:
+        dir_entries = sorted(it, key=lambda e: e.name)
 
-    for entry in sorted(os.listdir(target_dir)):
+    plans = []  # (src_path, entry, stem, ext, plan) in directory order
+    for dir_entry in dir_entries:
+        entry = dir_entry.name
         if entry.startswith('.'):
             # Skip hidden files
             continue
-        src_path = os.path.join(target_dir, entry)
-        if not os.path.isfile(src_path):
+        if not dir_entry.is_file():
             continue
-        if not is_comic_file(src_path):
+        parts = split_comic_name(entry)
+        if parts is None:
             continue
 
-        stem, ext = os.path.splitext(entry)
-        plan = plan_new_name_and_title(stem)
-        desired_stem = None if not plan else plan[1]
+        stem, ext = parts
+        plans.append((dir_entry.path, entry, stem, ext, plan_new_name_and_title(stem)))
 
+    # Phase 2: create each title folder once and load the external directory before any file is moved
+    title_dirs = {}  # title -> title folder path
+    for _, _, stem, _, plan in plans:
+        if plan and plan[1] and stem != plan[1] and plan[0] not in title_dirs:
+            title_dirs[plan[0]] = target_prefix + plan[0]
+    for title_dir in title_dirs.values():
+        ensure_dir(title_dir)
+    _external_index()
+
+    # Phase 3: decide every destination in directory order, so " (N)" suffixes don't
+    # depend on thread scheduling, then do the moves and duplicate checks in parallel
+    jobs = []  # (src_path, entry, stem, ext, plan, dest_path)
+    for src_path, entry, stem, ext, plan in plans:
+        desired_stem = None if not plan else plan[1]
         if not desired_stem:
+            dest_path = dest_names.reserve(error_dir, stem, ext)
+        elif stem == desired_stem:
+            dest_path = None
+        else:
+            # Place renamed files into a subfolder named after the Title
+            dest_path = dest_names.reserve(title_dirs[plan[0]], desired_stem, ext)
+        jobs.append((src_path, entry, stem, ext, plan, dest_path))
+
+    def apply_job(job):
+        """Carry out one planned move. Returns (status, is_duplicate, output_lines)."""
+        src_path, entry, stem, ext, plan, dest_path = job
+        lines = []
+
+        if not plan or not plan[1]:
             # Move to error
-            dest_path = unique_destination_path(error_dir, stem, ext)
             if verbose or dry_run:
-                print(f"Unparseable -> {os.path.relpath(dest_path, target_dir)}")
+                lines.append(f"Unparseable -> {dest_path[prefix_len:]}")
             if not dry_run:
                 try:
-                    shutil.move(src_path, dest_path)
+                    move_path(src_path, dest_path)
                 except Exception:
                     # Last-resort: count as error without moving
-                    pass
-            errored += 1
-            errors_list.append(entry)
-            continue
+                    dest_names.release(dest_path)
+            return "error", False, lines
 
         # If already exactly matches desired format, skip
-        if stem == desired_stem:
-            skipped += 1
+        if dest_path is None:
             if verbose:
-                print(f"OK        : {entry}")
-            continue
+                lines.append(f"OK        : {entry}")
+            return "skipped", False, lines
 
-        # Place renamed files into a subfolder named after the Title
-        title_dir = os.path.join(target_dir, plan[0])
-        ensure_dir(title_dir)
-        dest_path = unique_destination_path(title_dir, desired_stem, ext)
+        title_dir = os.path.dirname(dest_path)
         if verbose or dry_run:
-            print(f"RENAME    : {entry} -> {os.path.relpath(dest_path, target_dir)}")
+            lines.append(f"RENAME    : {entry} -> {dest_path[prefix_len:]}")
         if verbose:
-            print(f"FOLDER    : {os.path.relpath(title_dir, target_dir)}")
-        
+            lines.append(f"FOLDER    : {title_dir[prefix_len:]}")
+
         if not dry_run:
             try:
                 os.rename(src_path, dest_path)
-                renamed += 1
             except Exception as e:
                 # On any failure, move to error
-                err_dest = unique_destination_path(error_dir, stem, ext)
+                dest_names.release(dest_path)
+                err_dest = dest_names.reserve(error_dir, stem, ext)
                 if verbose:
-                    print(f"FAILED    : {entry} -> moving to {os.path.relpath(err_dest, target_dir)} ({e})")
+                    lines.append(f"FAILED    : {entry} -> moving to {err_dest[prefix_len:]} ({e})")
                 try:
-                    shutil.move(src_path, err_dest)
+                    move_path(src_path, err_dest)
                 except Exception:
-                    pass
-                errored += 1
-                errors_list.append(f"{entry} (rename failed)")
-                continue
-        else:
-            # In dry run, count as renamed (would be renamed)
-            renamed += 1
+                    dest_names.release(err_dest)
+                return "failed", False, lines
 
         # Check if this comic already exists in the external comics directory
         # Do this after renaming/moving so the file is properly organized first
-        desired_filename = desired_stem + ext
+        desired_filename = plan[1] + ext
         is_duplicate = check_external_duplicate(plan[0], desired_filename)
-        
-        if verbose or dry_run:
-            # Show duplicate check information
+
+        if (verbose or dry_run) and EXTERNAL_COMICS_DIR:
+            # Show duplicate check information (duplicate detection is off when unconfigured)
             external_path = os.path.join(EXTERNAL_COMICS_DIR, plan[0], desired_filename)
             if is_duplicate:
-                print(f"DUPLICATE : Found in external directory")
-                print(f"           External: {external_path}")
-                print(f"           Note: Entire folder '{plan[0]}' will be moved to possibleDuplicates")
+                lines.append(f"DUPLICATE : Found in external directory")
+                lines.append(f"           External: {external_path}")
+                lines.append(f"           Note: Entire folder '{plan[0]}' will be moved to possibleDuplicates")
             else:
-                print(f"CHECK     : Not found in external directory")
-                print(f"           External: {external_path}")
-        
-        if is_duplicate:
-            # Count as duplicate (in both dry run and actual run)
-            duplicates += 1
-            duplicates_list.append(f"{entry} → {desired_stem + ext}")
-            # Mark this title folder as having duplicates (will move entire folder later)
-            folders_with_duplicates.add(plan[0])
-
-    # After processing all files, move entire folders that contain duplicates
+                lines.append(f"CHECK     : Not found in external directory")
+                lines.append(f"           External: {external_path}")
+
+        # In dry run, count as renamed (would be renamed)
+        return "renamed", is_duplicate, lines
+
+    # Renames are independent syscalls, so overlap their latency (most noticeable on network shares)
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # map() yields results in job order, keeping output and counts deterministic
+        results = list(executor.map(apply_job, jobs))
+
+    # Write the per-file log in chunks rather than one print() per line
+    out_buf = []
+    for job, (status, is_duplicate, lines) in zip(jobs, results):
+        out_buf.extend(lines)
+        if len(out_buf) >= 256:
+            write_lines(out_buf)
+        entry, ext, plan = job[1], job[3], job[4]
+        if status == "error":
+            errored += 1
+            errors_list.append(entry)
+        elif status == "skipped":
+            skipped += 1
+        elif status == "failed":
+            errored += 1
+            errors_list.append(f"{entry} (rename failed)")
+        else:
+            renamed += 1
+            if is_duplicate:
+                # Count as duplicate (in both dry run and actual run)
+                duplicates += 1
+                duplicates_list.append(f"{entry} → {plan[1] + ext}")
+                # Mark this title folder as having duplicates (will move entire folder later)
+                folders_with_duplicates.add(plan[0])
+
+    write_lines(out_buf)
+
+    # Phase 4: move entire folders that contain duplicates
     for title in folders_with_duplicates:
-        title_dir = os.path.join(target_dir, title)
+        title_dir = target_prefix + title
         if os.path.isdir(title_dir):
             # Calculate destination for the entire folder
             duplicate_folder_dest = os.path.join(duplicates_dir, title)
@@ -493,21 +538,13 @@ def process_directory(target_dir: str, dry_run: bool, verbose: bool) -> Tuple[in
                 try:
                     # If destination exists, merge or rename
                     if os.path.exists(duplicate_folder_dest):
-                        # Move contents individually
-                        for item in os.listdir(title_dir):
-                            src_item = os.path.join(title_dir, item)
-                            dst_item = os.path.join(duplicate_folder_dest, item)
-                            if os.path.isfile(src_item):
-                                if not os.path.exists(dst_item):
-                                    shutil.move(src_item, dst_item)
-                                else:
-                                    # File exists, use unique name
-                                    base, ext = os.path.splitext(item)
-                                    counter = 1
-                                    while os.path.exists(dst_item):
-                                        dst_item = os.path.join(duplicate_folder_dest, f"{base} ({counter}){ext}")
-                                        counter += 1
-                                    shutil.move(src_item, dst_item)
+                        # Move contents individually, renaming on collision
+                        with os.scandir(title_dir) as it:
+                            items = [item for item in it if item.is_file()]
+                        for item in items:
+                            base, ext = os.path.splitext(item.name)
+                            dst_item = dest_names.reserve(duplicate_folder_dest, base, ext)
+                            move_path(item.path, dst_item)
                         # Remove empty source folder
                         try:
                             os.rmdir(title_dir)
@@ -515,7 +552,7 @@ def process_directory(target_dir: str, dry_run: bool, verbose: bool) -> Tuple[in
                             pass  # Folder not empty, leave it
                     else:
                         # Move entire folder
-                        shutil.move(title_dir, duplicate_folder_dest)
+                        move_path(title_dir, duplicate_folder_dest)
                 except Exception as e:
                     if verbose:
                         print(f"WARNING   : Could not move folder {title} to possibleDuplicates: {e}")